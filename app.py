@@ -1,14 +1,16 @@
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-import asyncio
-from datetime import datetime
+from typing import List, Dict, Any
+from urllib.parse import quote
+import csv
+import io
 import tempfile
+import orjson
 import pandas as pd
 
-from main import T2Scrap, Product, SearchResult, Config
+from main import T2Scrap, extract_price, clean_text, slugify
 
 app = FastAPI(title="T2Scrap", version="3.1.0")
 templates = Jinja2Templates(directory="templates")
@@ -26,26 +28,9 @@ class ExportRequest(BaseModel):
     format: str = "csv"
 
 
-def product_to_dict(p: Product) -> dict:
-    return {
-        "platform": p.platform,
-        "name": p.name,
-        "price": p.price,
-        "currency": p.currency,
-        "original_price": p.original_price,
-        "discount_percent": p.discount_percent,
-        "url": p.url if p.url else "",
-        "image_url": p.image_url if p.image_url else "",
-        "rating": p.rating,
-        "reviews_count": p.reviews_count,
-        "seller": p.seller,
-        "is_prime": p.is_prime,
-        "free_shipping": p.free_shipping,
-        "in_stock": p.in_stock,
-        "condition": p.condition,
-        "discount_display": p.discount_display,
-        "savings": p.savings
-    }
+def json_response(payload: Dict[str, Any]) -> Response:
+    # Serialise with orjson directly instead of FastAPI's jsonable_encoder pass
+    return Response(orjson.dumps(payload), media_type="application/json")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -58,15 +43,12 @@ async def search(request: SearchRequest):
     if len(request.query.strip()) < 2:
         raise HTTPException(400, "Query too short")
     
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(
-        None, lambda: t2scrap_engine.search(request.query, use_cache=request.use_cache)
-    )
+    result = await t2scrap_engine.search_async(request.query, use_cache=request.use_cache)
     
-    products = [product_to_dict(p) for p in result.products]
-    best_deal = product_to_dict(result.best_deal) if result.best_deal else None
+    products = [p.to_dict() for p in result.products]
+    best_deal = result.best_deal.to_dict() if result.best_deal else None
     
-    return {
+    return json_response({
         "query": result.query,
         "products": products,
         "total_products": result.total_products,
@@ -75,7 +57,26 @@ async def search(request: SearchRequest):
         "best_deal": best_deal,
         "price_range": result.price_range,
         "timestamp": result.timestamp
-    }
+    })
+
+
+def attachment_headers(filename: str) -> Dict[str, str]:
+    quoted = quote(filename)
+    if quoted != filename:
+        return {"Content-Disposition": f"attachment; filename*=utf-8''{quoted}"}
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+def iter_csv(rows: List[Dict[str, Any]], batch_size: int = 256):
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+    writer.writeheader()
+    for start in range(0, len(rows), batch_size):
+        writer.writerows(rows[start:start + batch_size])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
 
 
 @app.post("/api/export")
@@ -83,18 +84,32 @@ async def export_results(request: ExportRequest):
     if not request.products:
         raise HTTPException(400, "No products")
     
-    df = pd.DataFrame(request.products)
-    suffix = ".xlsx" if request.format == "excel" else f".{request.format}"
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
     filename = f"t2scrap_{request.query.replace(' ', '_')}"
     
     if request.format == "csv":
-        df.to_csv(temp_file.name, index=False)
-        return FileResponse(temp_file.name, media_type="text/csv", filename=f"{filename}.csv")
+        return StreamingResponse(
+            iter_csv(request.products), media_type="text/csv",
+            headers=attachment_headers(f"{filename}.csv")
+        )
     elif request.format == "json":
-        df.to_json(temp_file.name, orient="records", indent=2)
-        return FileResponse(temp_file.name, media_type="application/json", filename=f"{filename}.json")
+        content = orjson.dumps(request.products, option=orjson.OPT_INDENT_2)
+        return Response(content, media_type="application/json", headers=attachment_headers(f"{filename}.json"))
+    elif request.format == "arrow":
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise HTTPException(400, "Arrow export requires pyarrow")
+        table = pa.Table.from_pylist(request.products)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(
+            sink.getvalue().to_pybytes(), media_type="application/vnd.apache.arrow.stream",
+            headers=attachment_headers(f"{filename}.arrow")
+        )
     else:
+        df = pd.DataFrame(request.products)
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
         df.to_excel(temp_file.name, index=False)
         return FileResponse(temp_file.name, filename=f"{filename}.xlsx")
 
@@ -103,7 +118,12 @@ async def export_results(request: ExportRequest):
 async def get_stats():
     cache_stats = t2scrap_engine.cache.get_stats()
     history_stats = t2scrap_engine.history.get_stats()
-    return {"cache": cache_stats, "history": history_stats, "platforms": t2scrap_engine.platform_names}
+    parse_stats = {
+        "extract_price": extract_price.cache_info()._asdict(),
+        "clean_text": clean_text.cache_info()._asdict(),
+        "slugify": slugify.cache_info()._asdict()
+    }
+    return {"cache": cache_stats, "history": history_stats, "parsing": parse_stats, "platforms": t2scrap_engine.platform_names}
 
 
 @app.post("/api/clear-cache")
@@ -1,18 +1,31 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+import soupsieve as sv
+from lxml import etree, html as lxml_html
 import time
 import re
 from urllib.parse import quote_plus, urljoin, urlparse
 import random
-import hashlib
-import pickle
+import sqlite3
 from pathlib import Path
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, asdict, field
-from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Dict, Any, Tuple, Deque, Callable, Iterable, Iterator
+from collections import deque, OrderedDict
+from itertools import islice
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import heapq
+import atexit
+import asyncio
+from functools import partial, lru_cache
+from operator import attrgetter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 import json
+import orjson
 from datetime import datetime
 import logging
 
@@ -24,15 +37,22 @@ class Config:
     APP_NAME = "T2Scrap"
     VERSION = "3.2.0"
     TIMEOUT = 15
-    MAX_RETRIES = 2
-    RETRY_DELAY = 1
+    CONNECT_TIMEOUT = 3  # A stalled DNS lookup or handshake fails fast instead of using up TIMEOUT
+    SEARCH_TIMEOUT = TIMEOUT * 2  # Overall wait for all platforms in one search
+    MAX_RETRIES = 2  # Attempts per request, including the first
+    RETRY_BACKOFF = 0.3  # urllib3 retries the first time at once, so this only applies with MAX_RETRIES >= 3
     MAX_WORKERS = 5
+    WORKERS_PER_PLATFORM = 2  # Searches one platform may have in flight at once
+    CONCURRENCY_PER_HOST = 4
     RESULTS_PER_SITE = 15
-    CACHE_DIR = ".t2scrap_cache"
+    CACHE_DB = ".t2scrap_cache.db"
     CACHE_TTL = 3600
-    HISTORY_FILE = "t2scrap_history.json"
+    CACHE_MEMORY_ENTRIES = 512
+    HISTORY_FILE = "t2scrap_history.jsonl"
+    HISTORY_MAX_ENTRIES = 10_000
     LOG_FILE = "t2scrap.log"
     DEBUG = True  # Enable debug for troubleshooting
+    HTML_PARSER = "lxml"
 
 logging.basicConfig(
     level=logging.DEBUG if Config.DEBUG else logging.WARNING,
@@ -57,6 +77,19 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
 ]
 
+BASE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    # Only advertise codings urllib3 can decode: br once brotli is installed
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+}
+
 def get_random_ua() -> str:
     return random.choice(USER_AGENTS)
 
@@ -64,7 +97,10 @@ def get_random_ua() -> str:
 # Data Classes
 # ============================================================
 
-@dataclass
+def _now_iso() -> str:
+    return datetime.now().isoformat()
+
+@dataclass(slots=True)
 class Product:
     platform: str
     name: str
@@ -81,31 +117,52 @@ class Product:
     free_shipping: bool = False
     in_stock: bool = True
     condition: str = "New"
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+    timestamp: str = field(default_factory=_now_iso)
+    # Derived from the price fields once in __post_init__
+    savings: Optional[float] = field(init=False, default=None, repr=False, compare=False)
+    discount_display: str = field(init=False, default="", repr=False, compare=False)
     
-    @property
-    def savings(self) -> Optional[float]:
+    def __post_init__(self) -> None:
         if self.original_price and self.original_price > self.price:
-            return round(self.original_price - self.price, 2)
-        return None
-    
-    @property
-    def discount_display(self) -> str:
+            self.savings = round(self.original_price - self.price, 2)
         if self.discount_percent:
-            return f"-{self.discount_percent:.0f}%"
+            self.discount_display = f"-{self.discount_percent:.0f}%"
         elif self.savings and self.original_price:
             pct = (self.savings / self.original_price) * 100
-            return f"-{pct:.0f}%"
-        return ""
+            self.discount_display = f"-{pct:.0f}%"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # Flat literal build; asdict() deep-copies field by field
+        return {
+            'platform': self.platform,
+            'name': self.name,
+            'price': self.price,
+            'currency': self.currency,
+            'original_price': self.original_price,
+            'discount_percent': self.discount_percent,
+            'url': self.url,
+            'image_url': self.image_url,
+            'rating': self.rating,
+            'reviews_count': self.reviews_count,
+            'seller': self.seller,
+            'is_prime': self.is_prime,
+            'free_shipping': self.free_shipping,
+            'in_stock': self.in_stock,
+            'condition': self.condition,
+            'discount_display': self.discount_display,
+            'savings': self.savings,
+            'timestamp': self.timestamp,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Product':
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.init and f.name in data})
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     query: str
     products: List[Product]
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: str = field(default_factory=_now_iso)
     search_time: float = 0.0
     
     @property
@@ -133,28 +190,54 @@ class SearchResult:
 # Utilities
 # ============================================================
 
+_CURRENCY_SYMBOLS = (
+    ('$', 'USD'), ('£', 'GBP'), ('€', 'EUR'), ('¥', 'JPY'),
+    ('₹', 'INR'), ('Rs.', 'INR'), ('Rs', 'INR'), ('NPR', 'NPR'),
+    ('৳', 'BDT'), ('Tk', 'BDT'), ('PKR', 'PKR'), ('රු', 'LKR'),
+)
+_CURRENCY_CODES = 'USD|INR|EUR|GBP|NPR|BDT|PKR|LKR'
+_CURRENCY_CODE_RE = re.compile(rf'({_CURRENCY_CODES})', re.IGNORECASE)
+_SYMBOL_CURRENCY = dict(_CURRENCY_SYMBOLS)
+# "<symbol or code> 1,234.56" in one pass; a code leaves the caller's default currency
+_PRICE_SHAPE_RE = re.compile(
+    r'\s*(?:US\s*)?(?:(' + '|'.join(re.escape(symbol) for symbol, _ in _CURRENCY_SYMBOLS) + rf')|(?i:{_CURRENCY_CODES}))?'
+    r'\s*([0-9][0-9,]*(?:\.[0-9]{1,2})?)\s*'
+)
+_PRICE_NUM_RE = re.compile(r'(\d+(?:\.\d{1,2})?)')
+_STRIP_SEPARATORS = str.maketrans('', '', ', ')
+_FAST_SYMBOLS = {'$': 'USD', '£': 'GBP', '€': 'EUR', '₹': 'INR'}
+
+@lru_cache(maxsize=4096)
 def extract_price(text: str, default_currency: str = "USD") -> Tuple[Optional[float], str]:
     if not text:
         return None, default_currency
     
     text = text.strip()
-    currency_map = {
-        '$': 'USD', '£': 'GBP', '€': 'EUR', '¥': 'JPY',
-        '₹': 'INR', 'Rs': 'INR', 'Rs.': 'INR', 'NPR': 'NPR',
-        '৳': 'BDT', 'Tk': 'BDT', 'PKR': 'PKR', 'රු': 'LKR'
-    }
     
+    # Fast path for the common "$12.99" / "1,499" shape: skip the regex passes
+    symbol_currency = _FAST_SYMBOLS.get(text[:1])
+    number = (text[1:] if symbol_currency else text).replace(',', '').strip()
+    whole, _, fraction = number.partition('.')
+    if whole.isdigit() and number.isascii() and (not fraction or (fraction.isdigit() and len(fraction) <= 2)):
+        return float(number), symbol_currency or default_currency
+    
+    match = _PRICE_SHAPE_RE.fullmatch(text)
+    if match:
+        symbol, number = match.groups()
+        return float(number.replace(',', '')), _SYMBOL_CURRENCY[symbol] if symbol else default_currency
+    
+    # Anything else ("current price $4.88", "$20.00 to $50.00"): strip symbols and codes, take the first number
     currency = default_currency
-    for symbol, curr in currency_map.items():
+    for symbol, curr in _CURRENCY_SYMBOLS:
         if symbol in text:
             currency = curr
             text = text.replace(symbol, '')
             break
     
-    text = re.sub(r'(USD|INR|EUR|GBP|NPR|BDT|PKR|LKR)', '', text, flags=re.IGNORECASE)
-    text = text.replace(',', '').replace(' ', '').strip()
+    text = _CURRENCY_CODE_RE.sub('', text)
+    text = text.translate(_STRIP_SEPARATORS).strip()
     
-    match = re.search(r'(\d+(?:\.\d{1,2})?)', text)
+    match = _PRICE_NUM_RE.search(text)
     if match:
         try:
             return float(match.group(1)), currency
@@ -162,90 +245,309 @@ def extract_price(text: str, default_currency: str = "USD") -> Tuple[Optional[fl
             pass
     return None, currency
 
+# Symbols/codes a scraper's own currency is written with, e.g. "Rs. 1,200" on Daraz
+_NATIVE_PRICE_PREFIXES = {
+    'USD': r'USD|US\s*\$|\$', 'INR': r'INR|₹|Rs\.?', 'NPR': r'NPR|Rs\.?', 'PKR': r'PKR|Rs\.?',
+    'BDT': r'BDT|৳|Tk', 'LKR': r'LKR|රු|Rs\.?', 'GBP': r'GBP|£', 'EUR': r'EUR|€',
+}
+
+@lru_cache(maxsize=None)
+def price_extractor(currency: str) -> Callable[[str], Tuple[Optional[float], str]]:
+    """Build an extract_price specialised for one currency's plain "<symbol> 1,234.56" shape"""
+    prefix = _NATIVE_PRICE_PREFIXES.get(currency)
+    if prefix is None:
+        return partial(extract_price, default_currency=currency)
+    pattern = re.compile(rf'\s*(?:{prefix})?\s*([0-9][0-9,]*(?:\.[0-9]{{1,2}})?)\s*')
+    
+    def extract(text: str) -> Tuple[Optional[float], str]:
+        match = pattern.fullmatch(text) if text else None
+        if match:
+            return float(match.group(1).replace(',', '')), currency
+        return extract_price(text, currency)
+    return extract
+
+@lru_cache(maxsize=4096)
 def clean_text(text: str) -> str:
     if not text:
         return ""
-    text = ' '.join(text.split())
-    return text.strip()
+    # split()/join() already drops leading and trailing whitespace
+    return ' '.join(text.split())
+
+_SLUG_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9\s-]')
+_SLUG_SPACE_RE = re.compile(r'\s+')
+_SLUG_DASH_RE = re.compile(r'-+')
 
+@lru_cache(maxsize=2048)
 def slugify(text: str, max_length: int = 80) -> str:
     """Convert text to URL-friendly slug"""
     # Remove special characters
-    slug = re.sub(r'[^a-zA-Z0-9\s-]', '', text.lower())
+    slug = _SLUG_NON_ALNUM_RE.sub('', text.lower())
     # Replace spaces with hyphens
-    slug = re.sub(r'\s+', '-', slug)
+    slug = _SLUG_SPACE_RE.sub('-', slug)
     # Remove multiple hyphens
-    slug = re.sub(r'-+', '-', slug)
+    slug = _SLUG_DASH_RE.sub('-', slug)
     # Trim to max length
     return slug[:max_length].strip('-')
 
+def class_pattern(*names: str) -> re.Pattern:
+    """Match any of the class tokens in a SoupStrainer.
+    
+    While parsing, a strainer sees the raw class attribute ("s-item s-item__pl-on-bottom"),
+    so class_='s-item' would only accept elements carrying that single class.
+    """
+    return re.compile(r'(?:^|\s)(?:' + '|'.join(map(re.escape, names)) + r')(?:\s|$)')
+
+def parse_html(content: bytes, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Build a soup with the configured parser so every scraper parses the same way"""
+    return BeautifulSoup(content, Config.HTML_PARSER, parse_only=parse_only)
+
+def find_scripts(content: bytes, xpath: etree.XPath) -> List[str]:
+    """Text of the script tags a compiled XPath selects, read straight from lxml's tree"""
+    try:
+        tree = lxml_html.document_fromstring(content)
+    except etree.ParserError:
+        return []
+    return [script.text or '' for script in xpath(tree)]
+
+def select_first(element, selectors: Tuple[sv.SoupSieve, ...]):
+    """Return the match of the first compiled selector that finds anything"""
+    for selector in selectors:
+        match = selector.select_one(element)
+        if match is not None:
+            return match
+    return None
+
+def first_tags(element, rules: Dict[Tuple[str, Optional[str], Optional[str]], str]) -> Dict[str, Tag]:
+    """Walk element's descendants once, keeping the first tag that satisfies each rule.
+    
+    Rules map (tag name or '*', attribute, value) to a field key. For 'class' the value is a
+    single class token; for other attributes it must match exactly, or be None to only
+    require the attribute. (tag name, None, None) matches the tag alone. Document order
+    matches select_one(), so a rule finds the same tag as the equivalent simple selector
+    would; several rules sharing a key behave like a comma-separated selector group.
+    """
+    found: Dict[str, Tag] = {}
+    wanted = len(set(rules.values()))
+    for node in element.descendants:
+        if not isinstance(node, Tag):
+            continue
+        name = node.name
+        key = rules.get((name, None, None))
+        if key and key not in found:
+            found[key] = node
+        for attr, value in node.attrs.items():
+            tokens = (*value, None) if isinstance(value, list) else (value, None)
+            for token in tokens:
+                for rule in ((name, attr, token), ('*', attr, token)):
+                    key = rules.get(rule)
+                    if key and key not in found:
+                        found[key] = node
+        if len(found) == wanted:
+            break
+    return found
+
+def first_value(item: Dict[str, Any], keys: Tuple[str, ...], default: Any = '') -> Any:
+    """Return the first truthy value among item's keys, in order"""
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return default
+
+_FLOAT_TEXT_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')
+_INT_TEXT_RE = re.compile(r'-?\d+')
+
+def to_float(value: Any, thousands: bool = True) -> Optional[float]:
+    """Parse a number, or None if it isn't one.
+    
+    Commas are dropped as thousands separators unless `thousands` is False; ratings
+    pass False so a decimal-comma "4,5" is rejected rather than read as 45.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value)
+    if thousands:
+        text = text.replace(',', '')
+    text = text.strip()
+    return float(text) if _FLOAT_TEXT_RE.fullmatch(text) else None
+
+def to_int(value: Any) -> Optional[int]:
+    """Parse a whole number that may carry thousands separators, or None if it isn't one"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    text = str(value).replace(',', '').strip()
+    return int(text) if _INT_TEXT_RE.fullmatch(text) else None
+
+# Punctuation, plus the gap between letters and digits ("iphone15" -> "iphone 15")
+_QUERY_SPLIT_RE = re.compile(r'[^\w\s]|(?<=[^\W\d_])(?=\d)|(?<=\d)(?=[^\W\d_])')
+
+def canonical_query(query: str) -> str:
+    """Normalise a query so near-duplicates share one cache entry"""
+    return ' '.join(sorted(_QUERY_SPLIT_RE.sub(' ', query.lower()).split()))
+
+# Patterns used by the scrapers' per-item parsing
+_INT_RE = re.compile(r'(\d+)')
+_FLOAT_RE = re.compile(r'(\d+\.?\d*)')
+_COMMA_INT_RE = re.compile(r'([\d,]+)')
+_ITEM_ID_RE = re.compile(r'itemId[:\s]*(\d+)')
+_PRODUCT_ID_RE = re.compile(r'"productId":"(\d+)"')
+
+_JSON_DECODER = json.JSONDecoder()
+
+def extract_page_data(script_text: str) -> Optional[Dict[str, Any]]:
+    """Decode the object assigned to window.pageData, reading only as far as it extends"""
+    # The name can also appear in guards such as `if (window.pageData)`, so try each
+    # occurrence until one is an assignment of an object literal
+    marker = script_text.find('window.pageData')
+    while marker >= 0:
+        end = marker + len('window.pageData')
+        start = script_text.find('{', end)
+        if start < 0:
+            return None
+        if script_text[end:start].strip() == '=':
+            try:
+                data, _ = _JSON_DECODER.raw_decode(script_text, start)
+            except json.JSONDecodeError:
+                data = None
+            if isinstance(data, dict):
+                return data
+        marker = script_text.find('window.pageData', end)
+    return None
+
 class CacheManager:
-    def __init__(self, cache_dir: str = Config.CACHE_DIR, ttl: int = Config.CACHE_TTL):
-        self.cache_dir = Path(cache_dir)
+    def __init__(self, db_path: str = Config.CACHE_DB, ttl: int = Config.CACHE_TTL,
+                 memory_entries: int = Config.CACHE_MEMORY_ENTRIES):
+        self.db_path = Path(db_path)
         self.ttl = ttl
-        self.cache_dir.mkdir(exist_ok=True)
+        # In-process LRU of (timestamp, products) in front of the SQLite store
+        self._mem: OrderedDict[str, Tuple[float, List[Product]]] = OrderedDict()
+        self._mem_max = memory_entries
+        self._lock = threading.Lock()
+        # One shared connection; every statement runs under self._lock
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts REAL NOT NULL, blob BLOB NOT NULL)")
+        self._db.commit()
     
-    def _get_cache_path(self, key: str) -> Path:
-        hash_key = hashlib.md5(key.encode()).hexdigest()
-        return self.cache_dir / f"{hash_key}.pkl"
+    def _remember(self, key: str, timestamp: float, products: List[Product]) -> None:
+        with self._lock:
+            self._mem[key] = (timestamp, products)
+            self._mem.move_to_end(key)
+            if len(self._mem) > self._mem_max:
+                self._mem.popitem(last=False)
     
     def get(self, platform: str, query: str) -> Optional[List[Product]]:
-        key = f"{platform}:{query.lower().strip()}"
-        cache_path = self._get_cache_path(key)
+        key = f"{platform}:{canonical_query(query)}"
         
-        if cache_path.exists():
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry:
+                if time.time() - entry[0] < self.ttl:
+                    self._mem.move_to_end(key)
+                    return entry[1]
+                del self._mem[key]
+            
+            try:
+                row = self._db.execute("SELECT ts, blob FROM cache WHERE key = ?", (key,)).fetchone()
+                if row and time.time() - row[0] >= self.ttl:
+                    self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    row = None
+            except sqlite3.Error:
+                row = None
+        
+        if row:
             try:
-                with open(cache_path, 'rb') as f:
-                    data = pickle.load(f)
-                    if time.time() - data['timestamp'] < self.ttl:
-                        return data['products']
-                    else:
-                        cache_path.unlink()
+                products = [Product.from_dict(p) for p in orjson.loads(row[1])]
+                self._remember(key, row[0], products)
+                return products
             except Exception:
                 pass
         return None
     
     def set(self, platform: str, query: str, products: List[Product]) -> None:
-        key = f"{platform}:{query.lower().strip()}"
-        cache_path = self._get_cache_path(key)
+        key = f"{platform}:{canonical_query(query)}"
+        timestamp = time.time()
+        self._remember(key, timestamp, products)
         try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump({'timestamp': time.time(), 'products': products}, f)
+            blob = orjson.dumps([p.to_dict() for p in products])
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO cache (key, ts, blob) VALUES (?, ?, ?)", (key, timestamp, blob))
+                self._db.commit()
         except Exception:
             pass
     
     def clear(self) -> int:
-        count = 0
-        for file in self.cache_dir.glob("*.pkl"):
+        with self._lock:
+            self._mem.clear()
             try:
-                file.unlink()
-                count += 1
-            except Exception:
-                pass
+                count = self._db.execute("DELETE FROM cache").rowcount
+                self._db.commit()
+            except sqlite3.Error:
+                count = 0
         return count
     
     def get_stats(self) -> Dict[str, Any]:
-        files = list(self.cache_dir.glob("*.pkl"))
-        total_size = sum(f.stat().st_size for f in files)
-        return {'entries': len(files), 'size_bytes': total_size, 'size_mb': round(total_size / (1024 * 1024), 2)}
+        with self._lock:
+            entries, total_size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(blob)), 0) FROM cache").fetchone()
+            memory_entries = len(self._mem)
+        return {
+            'entries': entries, 'memory_entries': memory_entries,
+            'size_bytes': total_size, 'size_mb': round(total_size / (1024 * 1024), 2)
+        }
+    
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
 
 class SearchHistory:
-    def __init__(self, filepath: str = Config.HISTORY_FILE):
+    def __init__(self, filepath: str = Config.HISTORY_FILE, max_entries: int = Config.HISTORY_MAX_ENTRIES):
         self.filepath = Path(filepath)
-        self.history: List[Dict] = self._load()
+        self._import_legacy()
+        self.history: Deque[Dict] = self._load(max_entries)
+        # Lines are appended to the file by a background writer so add() never blocks on disk I/O.
+        # The file is opened here so a bad path fails loudly instead of inside the thread.
+        self._file = open(self.filepath, 'ab')
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="t2scrap-history", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
     
-    def _load(self) -> List[Dict]:
-        if self.filepath.exists():
-            try:
-                with open(self.filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                return []
-        return []
+    def _import_legacy(self) -> None:
+        """One-time move of entries from the old single-JSON-array history file"""
+        legacy = self.filepath.with_suffix('.json')
+        if self.filepath.exists() or legacy == self.filepath or not legacy.exists():
+            return
+        try:
+            with open(legacy, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not import old history file {legacy}: {e}")
+            return
+        if not isinstance(entries, list):
+            return
+        with open(self.filepath, 'ab') as f:
+            for entry in entries:
+                if isinstance(entry, dict):
+                    f.write(orjson.dumps(entry) + b'\n')
     
-    def _save(self) -> None:
-        with open(self.filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.history, f, indent=2, ensure_ascii=False)
+    def _load(self, max_entries: int) -> Deque[Dict]:
+        history: Deque[Dict] = deque(maxlen=max_entries)
+        if self.filepath.exists():
+            with open(self.filepath, 'rb') as f:
+                for line in f:
+                    try:
+                        history.append(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        continue
+        return history
     
     def add(self, result: SearchResult) -> None:
         entry = {
@@ -257,11 +559,45 @@ class SearchHistory:
             'best_platform': result.best_deal.platform if result.best_deal else None,
             'search_time': result.search_time
         }
-        self.history.append(entry)
-        self._save()
+        with self._lock:
+            self.history.append(entry)
+            if not self._closed:
+                self._queue.put(orjson.dumps(entry) + b'\n')
+    
+    def _write_loop(self) -> None:
+        try:
+            with self._file as f:
+                while True:
+                    line = self._queue.get()
+                    # Drain whatever else is queued so a burst of searches shares one flush
+                    while line is not None:
+                        f.write(line)
+                        try:
+                            line = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                    f.flush()
+                    if line is None:
+                        return
+        except Exception as e:
+            logger.error(f"History writer stopped, later searches will not be saved: {e}")
+        finally:
+            # Once the writer is gone add() only updates the in-memory history
+            with self._lock:
+                self._closed = True
+    
+    def close(self) -> None:
+        # Closed instances drop their exit hook, so constructing many doesn't pile them up
+        atexit.unregister(self.close)
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._writer.join(timeout=5)
     
     def get_recent(self, limit: int = 10) -> List[Dict]:
-        return self.history[-limit:][::-1]
+        return list(islice(reversed(self.history), limit))
     
     def get_stats(self) -> Dict[str, Any]:
         if not self.history:
@@ -271,6 +607,27 @@ class SearchHistory:
             'unique_queries': len(set(h['query'].lower() for h in self.history)),
         }
 
+class RateLimiter:
+    """Token bucket: up to `burst` calls go straight through, then callers wait for refill"""
+    
+    def __init__(self, rate_per_sec: float = 1.0, burst: int = 3):
+        self.rate = rate_per_sec
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve a token now (possibly going into debt) and sleep outside the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
 # ============================================================
 # Base Scraper
 # ============================================================
@@ -282,37 +639,47 @@ class BaseScraper(ABC):
         self.search_url: str = ""
         self.currency: str = "USD"
         self.session = requests.Session()
+        # Each scraper talks to one site (plus the odd redirect host), and the
+        # semaphore below caps in-flight requests, so the pools are sized to match.
+        # urllib3 retries connection errors and throttling/5xx responses, backing off from the second retry.
+        # MAX_RETRIES counts attempts, and Retry-After is ignored because the sleep
+        # would happen while holding a host slot, with no cap below SEARCH_TIMEOUT.
+        retries = Retry(
+            total=Config.MAX_RETRIES - 1, backoff_factor=Config.RETRY_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False,
+            respect_retry_after_header=False
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=Config.CONCURRENCY_PER_HOST, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Caps in-flight requests to this site across concurrent searches
+        self._host_slots = threading.BoundedSemaphore(Config.CONCURRENCY_PER_HOST)
+        self._header_variants: Optional[Tuple[Dict[str, str], ...]] = None
     
     def _get_headers(self) -> Dict[str, str]:
-        return {
-            'User-Agent': get_random_ua(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-        }
+        return {'User-Agent': get_random_ua(), **BASE_HEADERS}
+    
+    def _request_headers(self) -> Dict[str, str]:
+        """Pick one of the prebuilt header dicts, so each request still gets a random User-Agent"""
+        if self._header_variants is None:
+            headers = self._get_headers()
+            self._header_variants = tuple({**headers, 'User-Agent': ua} for ua in USER_AGENTS)
+        return random.choice(self._header_variants)
     
     @abstractmethod
     def search(self, query: str) -> List[Product]:
         pass
     
     def _make_request(self, url: str) -> Optional[requests.Response]:
-        for attempt in range(Config.MAX_RETRIES):
-            try:
-                headers = self._get_headers()
-                response = self.session.get(url, headers=headers, timeout=Config.TIMEOUT)
-                if response.status_code == 200:
-                    return response
-                logger.debug(f"Request to {url} returned status {response.status_code}")
-            except Exception as e:
-                logger.debug(f"Request error ({attempt+1}): {e}")
-            time.sleep(Config.RETRY_DELAY)
+        try:
+            with self._host_slots:
+                response = self.session.get(url, headers=self._request_headers(), timeout=(Config.CONNECT_TIMEOUT, Config.TIMEOUT))
+        except Exception as e:
+            logger.debug(f"Request error: {e}")
+            return None
+        if response.status_code == 200:
+            return response
+        logger.debug(f"Request to {url} returned status {response.status_code}")
         return None
 
 # ============================================================
@@ -320,6 +687,24 @@ class BaseScraper(ABC):
 # ============================================================
 
 class DarazScraper(BaseScraper):
+    # Selectors for the HTML fallback, compiled once and tried in order
+    _SEL_CARDS = tuple(sv.compile(s) for s in (
+        '[data-qa-locator="product-item"]', '.gridItem--Yd0sa', 'div[data-tracking="product-card"]',
+        '.Bm3ON', 'div[data-item-id]'
+    ))
+    _XPATH_PAGE_DATA = etree.XPath('//script[contains(text(), "listItems") or contains(text(), "window.pageData")]')
+    # API item fields that may hold a direct product URL, in priority order
+    _URL_FIELDS = ('itemUrl', 'productUrl', 'href', 'link', 'url')
+    # first_tags() rules for the HTML fallback's result cards
+    _CARD_FIELDS = {
+        ('*', 'class', 'title--wFj93'): 'name_title', ('*', 'data-qa-locator', 'product-name'): 'name_locator',
+        ('a', 'title', None): 'name_link', ('h2', None, None): 'name_heading', ('*', 'class', 'title'): 'name_class',
+        ('a', 'href', None): 'link', ('img', None, None): 'image',
+    }
+    _SEL_PRICE = tuple(sv.compile(s) for s in (
+        '.price--NVB62', '[data-qa-locator="product-price"]', '.price', '[class*="price"]'
+    ))
+    
     def __init__(self, country: str = "np"):
         super().__init__()
         self.name = "Daraz"
@@ -333,6 +718,7 @@ class DarazScraper(BaseScraper):
         }
         
         self.base_url, self.currency = country_config.get(country, country_config['np'])
+        self._extract_price = price_extractor(self.currency)
         self.search_url = self.base_url + "/catalog/?q={query}"
     
     def search(self, query: str) -> List[Product]:
@@ -340,22 +726,20 @@ class DarazScraper(BaseScraper):
         if not products:
             logger.info("API search failed, trying HTML scraping...")
             products = self._search_html(query)
-        return products[:Config.RESULTS_PER_SITE]
+        return products
     
     def _build_product_url(self, item: dict, name: str) -> str:
         """Build proper Daraz product URL from API response item"""
         
         # Method 1: Try to get direct URL from various fields
-        url_fields = ['itemUrl', 'productUrl', 'href', 'link', 'url']
-        
-        for field in url_fields:
+        for field in self._URL_FIELDS:
             url = item.get(field, '')
             if url and isinstance(url, str):
                 # Fix protocol-relative URLs
-                if url.startswith('//'):
+                if url[:2] == '//':
                     url = 'https:' + url
                 # Fix relative URLs
-                elif url.startswith('/'):
+                elif url[0] == '/':
                     url = self.base_url + url
                 # Add base URL if needed
                 elif not url.startswith('http'):
@@ -367,8 +751,8 @@ class DarazScraper(BaseScraper):
                     return url
         
         # Method 2: Build URL from item ID and SKU
-        item_id = item.get('itemId') or item.get('nid') or item.get('id')
-        sku_id = item.get('skuId') or item.get('sku')
+        item_id = first_value(item, ('itemId', 'nid', 'id'), None)
+        sku_id = first_value(item, ('skuId', 'sku'), None)
         
         if item_id:
             # Create URL-friendly slug from product name
@@ -386,7 +770,7 @@ class DarazScraper(BaseScraper):
         # Some responses have the URL embedded in clickTrackInfo or similar
         click_info = item.get('clickTrackInfo', '')
         if click_info and 'itemId' in str(click_info):
-            match = re.search(r'itemId[:\s]*(\d+)', str(click_info))
+            match = _ITEM_ID_RE.search(str(click_info))
             if match:
                 item_id = match.group(1)
                 slug = slugify(name)
@@ -403,20 +787,21 @@ class DarazScraper(BaseScraper):
             # Use the catalog search endpoint
             api_url = f"{self.base_url}/catalog/?ajax=true&q={quote_plus(query)}"
             
-            headers = self._get_headers()
-            headers.update({
+            headers = {
+                **self._request_headers(),
                 'X-Requested-With': 'XMLHttpRequest',
                 'Accept': 'application/json, text/javascript, */*; q=0.01',
                 'Referer': f"{self.base_url}/catalog/?q={quote_plus(query)}",
-            })
+            }
             
             logger.info(f"Fetching Daraz API: {api_url}")
-            response = self.session.get(api_url, headers=headers, timeout=Config.TIMEOUT)
+            with self._host_slots:
+                response = self.session.get(api_url, headers=headers, timeout=(Config.CONNECT_TIMEOUT, Config.TIMEOUT))
             
             if response.status_code == 200:
                 try:
-                    data = response.json()
-                except json.JSONDecodeError:
+                    data = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
                     logger.error("Failed to parse Daraz API response as JSON")
                     return products
                 
@@ -428,22 +813,24 @@ class DarazScraper(BaseScraper):
                 if items and Config.DEBUG:
                     logger.debug(f"Sample item keys: {list(items[0].keys())}")
                 
+                seen = set()
                 for item in items:
+                    if len(products) >= Config.RESULTS_PER_SITE:
+                        break
                     try:
-                        # Get price
-                        price = None
-                        price_val = item.get('price')
-                        if price_val:
-                            try:
-                                price = float(str(price_val).replace(',', ''))
-                            except ValueError:
-                                continue
+                        g = item.get
+                        # Colour/size variants can be listed more than once under one item id
+                        item_id = first_value(item, ('itemId', 'nid'), None)
+                        if item_id and item_id in seen:
+                            continue
                         
+                        # Get price
+                        price = to_float(g('price'))
                         if not price or price <= 0:
                             continue
                         
                         # Get name
-                        name = clean_text(item.get('name', ''))
+                        name = clean_text(g('name', ''))
                         if not name:
                             continue
                         
@@ -451,42 +838,24 @@ class DarazScraper(BaseScraper):
                         product_url = self._build_product_url(item, name)
                         
                         # Get original price
-                        original = None
-                        orig_price = item.get('originalPrice')
-                        if orig_price:
-                            try:
-                                original = float(str(orig_price).replace(',', ''))
-                            except ValueError:
-                                pass
+                        original = to_float(g('originalPrice'))
                         
                         # Get discount
                         discount = None
-                        disc = item.get('discount')
+                        disc = g('discount')
                         if disc:
-                            match = re.search(r'(\d+)', str(disc))
+                            match = _INT_RE.search(str(disc))
                             if match:
                                 discount = float(match.group(1))
                         
                         # Get rating
-                        rating = None
-                        rating_val = item.get('ratingScore')
-                        if rating_val:
-                            try:
-                                rating = float(rating_val)
-                            except ValueError:
-                                pass
+                        rating = to_float(g('ratingScore'), thousands=False)
                         
                         # Get reviews count
-                        reviews = None
-                        reviews_val = item.get('review') or item.get('reviewCount')
-                        if reviews_val:
-                            try:
-                                reviews = int(str(reviews_val).replace(',', ''))
-                            except ValueError:
-                                pass
+                        reviews = to_int(first_value(item, ('review', 'reviewCount'), None))
                         
                         # Get image URL
-                        image = item.get('image', '') or item.get('thumbUrl', '')
+                        image = first_value(item, ('image', 'thumbUrl'))
                         if image:
                             if image.startswith('//'):
                                 image = 'https:' + image
@@ -494,17 +863,17 @@ class DarazScraper(BaseScraper):
                                 image = 'https://' + image.lstrip('/')
                         
                         # Get seller info
-                        seller = item.get('sellerName', '') or item.get('brandName', '')
+                        seller = first_value(item, ('sellerName', 'brandName'))
                         
                         # Check shipping
-                        free_shipping = item.get('freeShipping', False)
+                        free_shipping = g('freeShipping', False)
                         if not free_shipping:
-                            # Check in icons or tags
-                            icons = item.get('icons', [])
-                            for icon in icons:
-                                if 'free' in str(icon).lower() and 'ship' in str(icon).lower():
-                                    free_shipping = True
-                                    break
+                            # Check in icons or tags, lowering each icon once
+                            icons = g('icons') or ()
+                            free_shipping = any(
+                                'free' in label and 'ship' in label
+                                for label in (str(icon).lower() for icon in icons)
+                            )
                         
                         product = Product(
                             platform=self.name,
@@ -522,6 +891,8 @@ class DarazScraper(BaseScraper):
                         )
                         
                         products.append(product)
+                        if item_id:
+                            seen.add(item_id)
                         logger.debug(f"Added product: {name[:50]}... URL: {product_url[:80]}...")
                         
                     except Exception as e:
@@ -549,77 +920,79 @@ class DarazScraper(BaseScraper):
             logger.error("Failed to fetch Daraz HTML page")
             return products
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Try to find embedded JSON data (Daraz often embeds product data in script tags)
+        # Try to find embedded JSON data (Daraz often embeds product data in script tags).
+        # XPath picks the candidate scripts out in libxml2, so no soup is built unless
+        # the card fallback below needs one.
         script_data = None
-        for script in soup.find_all('script'):
-            script_text = script.string or ''
-            if 'listItems' in script_text or 'window.pageData' in script_text:
-                # Try to extract JSON from script
-                match = re.search(r'window\.pageData\s*=\s*(\{.*?\});', script_text, re.DOTALL)
-                if match:
-                    try:
-                        script_data = json.loads(match.group(1))
-                        items = script_data.get('mods', {}).get('listItems', [])
-                        if items:
-                            logger.info(f"Found {len(items)} items in embedded JSON")
-                            for item in items:
-                                try:
-                                    price = float(item.get('price', 0))
-                                    if not price:
-                                        continue
-                                    name = clean_text(item.get('name', ''))
-                                    if not name:
-                                        continue
-                                    
-                                    product_url = self._build_product_url(item, name)
-                                    
-                                    image = item.get('image', '')
-                                    if image and image.startswith('//'):
-                                        image = 'https:' + image
-                                    
-                                    products.append(Product(
-                                        platform=self.name,
-                                        name=name[:150],
-                                        price=price,
-                                        currency=self.currency,
-                                        url=product_url,
-                                        image_url=image
-                                    ))
-                                except:
+        for script_text in find_scripts(response.content, self._XPATH_PAGE_DATA):
+            # Try to extract JSON from script
+            script_data = extract_page_data(script_text)
+            if script_data:
+                try:
+                    items = script_data.get('mods', {}).get('listItems', [])
+                    if items:
+                        logger.info(f"Found {len(items)} items in embedded JSON")
+                        seen = set()
+                        for item in items:
+                            if len(products) >= Config.RESULTS_PER_SITE:
+                                break
+                            try:
+                                item_id = first_value(item, ('itemId', 'nid'), None)
+                                if item_id and item_id in seen:
+                                    continue
+                                price = to_float(item.get('price'))
+                                if not price:
+                                    continue
+                                name = clean_text(item.get('name', ''))
+                                if not name:
                                     continue
-                    except json.JSONDecodeError:
-                        pass
+                                
+                                product_url = self._build_product_url(item, name)
+                                
+                                image = item.get('image', '')
+                                if image and image.startswith('//'):
+                                    image = 'https:' + image
+                                
+                                products.append(Product(
+                                    platform=self.name,
+                                    name=name[:150],
+                                    price=price,
+                                    currency=self.currency,
+                                    url=product_url,
+                                    image_url=image
+                                ))
+                                if item_id:
+                                    seen.add(item_id)
+                            except:
+                                continue
+                except AttributeError:
+                    pass
         
         if products:
             return products
         
-        # Fallback: Try HTML selectors
-        selectors = [
-            '[data-qa-locator="product-item"]',
-            '.gridItem--Yd0sa',
-            'div[data-tracking="product-card"]',
-            '.Bm3ON',
-            'div[data-item-id]'
-        ]
+        soup = parse_html(response.content)
         
+        # Fallback: Try HTML selectors
         cards = []
-        for selector in selectors:
-            cards = soup.select(selector)
+        for selector in self._SEL_CARDS:
+            cards = selector.select(soup)
             if cards:
-                logger.info(f"Found {len(cards)} cards with selector: {selector}")
+                logger.info(f"Found {len(cards)} cards with selector: {selector.pattern}")
                 break
         
         for card in cards:
+            if len(products) >= Config.RESULTS_PER_SITE:
+                break
             try:
+                fields = first_tags(card, self._CARD_FIELDS)
                 # Find name
                 name_elem = (
-                    card.select_one('.title--wFj93') or
-                    card.select_one('[data-qa-locator="product-name"]') or
-                    card.select_one('a[title]') or
-                    card.select_one('h2') or
-                    card.select_one('.title')
+                    fields.get('name_title') or
+                    fields.get('name_locator') or
+                    fields.get('name_link') or
+                    fields.get('name_heading') or
+                    fields.get('name_class')
                 )
                 
                 if not name_elem:
@@ -630,22 +1003,17 @@ class DarazScraper(BaseScraper):
                     continue
                 
                 # Find price
-                price_elem = (
-                    card.select_one('.price--NVB62') or
-                    card.select_one('[data-qa-locator="product-price"]') or
-                    card.select_one('.price') or
-                    card.select_one('[class*="price"]')
-                )
+                price_elem = select_first(card, self._SEL_PRICE)
                 
                 if not price_elem:
                     continue
                 
-                price, _ = extract_price(price_elem.get_text(), self.currency)
+                price, _ = self._extract_price(price_elem.get_text())
                 if not price:
                     continue
                 
                 # Find URL - this is the key part
-                link = card.find('a', href=True)
+                link = fields.get('link')
                 product_url = ""
                 
                 if link:
@@ -661,7 +1029,7 @@ class DarazScraper(BaseScraper):
                             product_url = self.base_url + '/' + href
                 
                 # Find image
-                img = card.find('img')
+                img = fields.get('image')
                 image_url = ""
                 if img:
                     image_url = img.get('src') or img.get('data-src', '')
@@ -689,12 +1057,27 @@ class DarazScraper(BaseScraper):
 # ============================================================
 
 class EbayScraper(BaseScraper):
+    _SEL_CARD = sv.compile('.s-item')
+    # Card classes that mark placeholders such as the "Shop on eBay" tile
+    _SKIP_CLASSES = frozenset({'s-item__pl-on-bottom'})
+    _SEL_TITLE_SPAN = sv.compile('.s-item__title span')
+    # first_tags() rules for the rest of a card's fields
+    _CARD_FIELDS = {
+        ('*', 'class', 's-item__title'): 'title', ('*', 'class', 's-item__price'): 'price',
+        ('a', 'class', 's-item__link'): 'link', ('*', 'class', 's-item__image-img'): 'image',
+        ('*', 'class', 'SECONDARY_INFO'): 'condition',
+        ('*', 'class', 's-item__shipping'): 'shipping', ('*', 'class', 's-item__freeXDays'): 'shipping',
+    }
+    # Only result cards are needed; skip building the rest of the page
+    _STRAINER = SoupStrainer(class_=class_pattern('s-item'))
+    
     def __init__(self):
         super().__init__()
         self.name = "eBay"
         self.base_url = "https://www.ebay.com"
         self.search_url = "https://www.ebay.com/sch/i.html?_nkw={query}&_sacat=0"
         self.currency = "USD"
+        self._extract_price = price_extractor(self.currency)
     
     def search(self, query: str) -> List[Product]:
         products = []
@@ -704,18 +1087,21 @@ class EbayScraper(BaseScraper):
         if not response:
             return products
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        cards = soup.select('.s-item')
+        soup = parse_html(response.content, parse_only=self._STRAINER)
+        cards = self._SEL_CARD.select(soup)
         
         for card in cards:
+            if len(products) >= Config.RESULTS_PER_SITE:
+                break
             try:
                 # Skip non-product items
-                classes = card.get('class', [])
-                if 's-item__pl-on-bottom' in classes:
+                if not self._SKIP_CLASSES.isdisjoint(card.get('class') or ()):
                     continue
                 
+                fields = first_tags(card, self._CARD_FIELDS)
+                
                 # Name
-                name_elem = card.select_one('.s-item__title span') or card.select_one('.s-item__title')
+                name_elem = self._SEL_TITLE_SPAN.select_one(card) or fields.get('title')
                 if not name_elem:
                     continue
                 name = clean_text(name_elem.get_text())
@@ -723,7 +1109,7 @@ class EbayScraper(BaseScraper):
                     continue
                 
                 # Price
-                price_elem = card.select_one('.s-item__price')
+                price_elem = fields.get('price')
                 if not price_elem:
                     continue
                 price_text = price_elem.get_text()
@@ -732,12 +1118,12 @@ class EbayScraper(BaseScraper):
                 if ' to ' in price_text.lower():
                     price_text = price_text.split(' to ')[0]
                 
-                price, _ = extract_price(price_text, self.currency)
+                price, _ = self._extract_price(price_text)
                 if not price:
                     continue
                 
                 # URL
-                link_elem = card.select_one('a.s-item__link')
+                link_elem = fields.get('link')
                 product_url = ""
                 if link_elem:
                     product_url = link_elem.get('href', '')
@@ -746,20 +1132,20 @@ class EbayScraper(BaseScraper):
                         product_url = urljoin(self.base_url, product_url)
                 
                 # Image
-                img_elem = card.select_one('.s-item__image-img')
+                img_elem = fields.get('image')
                 image_url = ""
                 if img_elem:
                     image_url = img_elem.get('src') or img_elem.get('data-src', '')
                 
                 # Condition
                 condition = "New"
-                condition_elem = card.select_one('.SECONDARY_INFO')
+                condition_elem = fields.get('condition')
                 if condition_elem:
                     condition = clean_text(condition_elem.get_text())
                 
                 # Free shipping
                 free_shipping = False
-                shipping_elem = card.select_one('.s-item__shipping, .s-item__freeXDays')
+                shipping_elem = fields.get('shipping')
                 if shipping_elem:
                     shipping_text = shipping_elem.get_text().lower()
                     free_shipping = 'free' in shipping_text
@@ -778,19 +1164,30 @@ class EbayScraper(BaseScraper):
                 logger.debug(f"eBay parse error: {e}")
                 continue
         
-        return products[:Config.RESULTS_PER_SITE]
+        return products
 
 # ============================================================
 # AliExpress Scraper
 # ============================================================
 
 class AliExpressScraper(BaseScraper):
+    _SEL_CARDS = (sv.compile('[class*="SearchResult"]'), sv.compile('[class*="product-card"]'))
+    _SEL_TITLE = sv.compile('[class*="title"]')
+    _SEL_PRICE = sv.compile('[class*="price"]')
+    # first_tags() rules for the card fields plain tag lookups can find
+    _CARD_FIELDS = {
+        ('h1', None, None): 'name_h1', ('h3', None, None): 'name_h3',
+        ('a', 'href', None): 'link', ('img', None, None): 'image',
+    }
+    _XPATH_SCRIPTS = etree.XPath('//script[contains(text(), "window._dida_config_") or contains(text(), "runParams")]')
+    
     def __init__(self):
         super().__init__()
         self.name = "AliExpress"
         self.base_url = "https://www.aliexpress.com"
         self.search_url = "https://www.aliexpress.com/w/wholesale-{query}.html"
         self.currency = "USD"
+        self._extract_price = price_extractor(self.currency)
     
     def search(self, query: str) -> List[Product]:
         products = []
@@ -802,42 +1199,49 @@ class AliExpressScraper(BaseScraper):
         if not response:
             return products
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
         # Try to find JSON data in script tags
-        for script in soup.find_all('script'):
-            script_text = script.string or ''
-            if 'window._dida_config_' in script_text or 'runParams' in script_text:
-                # Try to extract product data
-                matches = re.findall(r'"productId":"(\d+)"', script_text)
-                for product_id in matches[:Config.RESULTS_PER_SITE]:
-                    products.append(Product(
-                        platform=self.name,
-                        name=f"AliExpress Product {product_id}",
-                        price=0.01,  # Placeholder
-                        currency=self.currency,
-                        url=f"https://www.aliexpress.com/item/{product_id}.html"
-                    ))
+        for script_text in find_scripts(response.content, self._XPATH_SCRIPTS):
+            remaining = Config.RESULTS_PER_SITE - len(products)
+            if remaining <= 0:
+                break
+            # Try to extract product data, scanning only as far as the ids still needed
+            for match in islice(_PRODUCT_ID_RE.finditer(script_text), remaining):
+                product_id = match.group(1)
+                products.append(Product(
+                    platform=self.name,
+                    name=f"AliExpress Product {product_id}",
+                    price=0.01,  # Placeholder
+                    currency=self.currency,
+                    url=f"https://www.aliexpress.com/item/{product_id}.html"
+                ))
         
         # Try HTML selectors
         if not products:
-            cards = soup.select('[class*="SearchResult"]') or soup.select('[class*="product-card"]')
+            soup = parse_html(response.content)
+            cards = []
+            for selector in self._SEL_CARDS:
+                cards = selector.select(soup)
+                if cards:
+                    break
             
-            for card in cards[:Config.RESULTS_PER_SITE]:
+            for card in cards:
+                if len(products) >= Config.RESULTS_PER_SITE:
+                    break
                 try:
-                    name_elem = card.select_one('h1') or card.select_one('h3') or card.select_one('[class*="title"]')
+                    fields = first_tags(card, self._CARD_FIELDS)
+                    name_elem = fields.get('name_h1') or fields.get('name_h3') or self._SEL_TITLE.select_one(card)
                     if not name_elem:
                         continue
                     name = clean_text(name_elem.get_text())
                     
-                    price_elem = card.select_one('[class*="price"]')
+                    price_elem = self._SEL_PRICE.select_one(card)
                     if not price_elem:
                         continue
-                    price, _ = extract_price(price_elem.get_text(), self.currency)
+                    price, _ = self._extract_price(price_elem.get_text())
                     if not price:
                         continue
                     
-                    link = card.find('a', href=True)
+                    link = fields.get('link')
                     product_url = ""
                     if link:
                         product_url = link['href']
@@ -846,7 +1250,7 @@ class AliExpressScraper(BaseScraper):
                         elif not product_url.startswith('http'):
                             product_url = urljoin(self.base_url, product_url)
                     
-                    img = card.find('img')
+                    img = fields.get('image')
                     image_url = ""
                     if img:
                         image_url = img.get('src') or img.get('data-src', '')
@@ -871,6 +1275,12 @@ class AliExpressScraper(BaseScraper):
 # ============================================================
 
 class AmazonScraper(BaseScraper):
+    _SEL_CARDS = (sv.compile('[data-component-type="s-search-result"]'), sv.compile('.s-result-item[data-asin]'))
+    # Card classes that mark ad slots, checked before walking the card for a sponsored label
+    _SKIP_CLASSES = frozenset({'AdHolder'})
+    # Cards without a data-asin are skipped anyway, so only build subtrees that carry one
+    _STRAINER = SoupStrainer(attrs={'data-asin': True})
+    
     def __init__(self, domain: str = "com"):
         super().__init__()
         self.name = "Amazon"
@@ -878,6 +1288,8 @@ class AmazonScraper(BaseScraper):
         self.base_url = f"https://www.amazon.{domain}"
         self.search_url = f"https://www.amazon.{domain}/s?k={{query}}"
         self.currency = "USD" if domain == "com" else "INR" if domain == "in" else "USD"
+        self._extract_price = price_extractor(self.currency)
+        self._rate_limiter = RateLimiter(rate_per_sec=1.0, burst=2)
     
     def _get_headers(self) -> Dict[str, str]:
         headers = super()._get_headers()
@@ -891,36 +1303,106 @@ class AmazonScraper(BaseScraper):
         })
         return headers
     
+    @staticmethod
+    def _card_state(node: Tag, state: Tuple[bool, ...]) -> Tuple[bool, ...]:
+        """Ancestor flags (h2, h2 a, .a-price, .a-text-price, .a-icon-star-small) for node's children"""
+        in_h2, in_h2_a, in_price, in_text_price, in_star = state
+        classes = node.get('class') or ()
+        return (
+            in_h2 or node.name == 'h2',
+            in_h2_a or (in_h2 and node.name == 'a'),
+            in_price or 'a-price' in classes,
+            in_text_price or 'a-text-price' in classes,
+            in_star or 'a-icon-star-small' in classes,
+        )
+    
+    def _collect_fields(self, card: Tag) -> Dict[str, Tag]:
+        """Find every field of a result card in one walk over its subtree.
+        
+        Each key gets the first tag in document order matching the selector noted beside it,
+        i.e. what card.select_one(selector) would return.
+        """
+        found: Dict[str, Tag] = {}
+        # Seed the flags from the card and everything above it, as CSS matching would
+        root_state = (False,) * 5
+        for ancestor in reversed([card, *card.parents]):
+            root_state = self._card_state(ancestor, root_state)
+        stack = [(child, root_state) for child in reversed(card.contents)]
+        while stack:
+            node, state = stack.pop()
+            if not isinstance(node, Tag):
+                continue
+            in_h2, in_h2_a, in_price, in_text_price, in_star = state
+            classes = node.get('class') or ()
+            if node.name == 'span':
+                if in_h2_a:
+                    found.setdefault('name_link', node)        # h2 a span
+                if in_h2:
+                    found.setdefault('name_heading', node)     # h2 span
+                if 'a-size-base' in classes and 's-underline-text' in classes:
+                    found.setdefault('reviews_text', node)     # span.a-size-base.s-underline-text
+            if classes:
+                if 's-sponsored-label-info-icon' in classes:
+                    found.setdefault('sponsored', node)        # .s-sponsored-label-info-icon
+                if 'a-text-normal' in classes:
+                    found.setdefault('name_text', node)        # .a-text-normal
+                if 'a-offscreen' in classes:
+                    if in_price:
+                        found.setdefault('price', node)        # .a-price .a-offscreen
+                    if in_text_price:
+                        found.setdefault('original', node)     # .a-text-price .a-offscreen
+                if 'a-price-whole' in classes:
+                    found.setdefault('price_whole', node)      # .a-price-whole
+                if 'a-price-fraction' in classes:
+                    found.setdefault('price_fraction', node)   # .a-price-fraction
+                if node.name == 'img' and 's-image' in classes:
+                    found.setdefault('image', node)            # img.s-image
+                if in_star and 'a-icon-alt' in classes:
+                    found.setdefault('rating', node)           # .a-icon-star-small .a-icon-alt
+                if 'a-icon-prime' in classes:
+                    found.setdefault('prime', node)            # .a-icon-prime
+            if 'reviews' in (node.get('data-csa-c-content-id') or ''):
+                found.setdefault('reviews_link', node)         # [data-csa-c-content-id*="reviews"]
+            if node.contents:
+                child_state = self._card_state(node, state)
+                stack.extend((child, child_state) for child in reversed(node.contents))
+        return found
+    
     def search(self, query: str) -> List[Product]:
         products = []
         url = self.search_url.format(query=quote_plus(query))
         
-        time.sleep(random.uniform(0.5, 1.5))
+        self._rate_limiter.acquire()
         
         response = self._make_request(url)
         if not response:
             return products
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = parse_html(response.content, parse_only=self._STRAINER)
         
-        cards = soup.select('[data-component-type="s-search-result"]')
-        if not cards:
-            cards = soup.select('.s-result-item[data-asin]')
+        cards = []
+        for selector in self._SEL_CARDS:
+            cards = selector.select(soup)
+            if cards:
+                break
         
+        # Sponsored and organic blocks can both carry the same ASIN
+        seen = set()
         for card in cards:
+            if len(products) >= Config.RESULTS_PER_SITE:
+                break
             try:
-                if card.select_one('.s-sponsored-label-info-icon'):
+                asin = card.get('data-asin', '')
+                if not asin or asin in seen:
+                    continue
+                if not self._SKIP_CLASSES.isdisjoint(card.get('class') or ()):
                     continue
                 
-                asin = card.get('data-asin', '')
-                if not asin:
+                fields = self._collect_fields(card)
+                if 'sponsored' in fields:
                     continue
                 
-                name_elem = (
-                    card.select_one('h2 a span') or
-                    card.select_one('h2 span') or
-                    card.select_one('.a-text-normal')
-                )
+                name_elem = fields.get('name_link') or fields.get('name_heading') or fields.get('name_text')
                 if not name_elem:
                     continue
                 name = clean_text(name_elem.get_text())
@@ -928,53 +1410,51 @@ class AmazonScraper(BaseScraper):
                     continue
                 
                 price = None
-                price_elem = card.select_one('.a-price .a-offscreen')
+                price_elem = fields.get('price')
                 if price_elem:
-                    price, _ = extract_price(price_elem.get_text(), self.currency)
+                    price, _ = self._extract_price(price_elem.get_text())
                 
                 if not price:
-                    whole = card.select_one('.a-price-whole')
+                    whole = fields.get('price_whole')
                     if whole:
-                        try:
-                            price_str = whole.get_text().replace(',', '').replace('.', '')
-                            price = float(price_str)
-                            fraction = card.select_one('.a-price-fraction')
-                            if fraction:
-                                price += float(fraction.get_text()) / 100
-                        except:
-                            pass
+                        price = to_float(whole.get_text().replace('.', ''))
+                        fraction = fields.get('price_fraction')
+                        if price and fraction:
+                            cents = to_float(fraction.get_text())
+                            if cents:
+                                price += cents / 100
                 
                 if not price:
                     continue
                 
                 original_price = None
-                original_elem = card.select_one('.a-text-price .a-offscreen')
+                original_elem = fields.get('original')
                 if original_elem:
-                    original_price, _ = extract_price(original_elem.get_text())
+                    original_price, _ = self._extract_price(original_elem.get_text())
                 
                 # Build URL from ASIN
                 product_url = f"{self.base_url}/dp/{asin}"
                 
                 image_url = ""
-                img_elem = card.select_one('img.s-image')
+                img_elem = fields.get('image')
                 if img_elem:
                     image_url = img_elem.get('src', '')
                 
                 rating = None
-                rating_elem = card.select_one('.a-icon-star-small .a-icon-alt')
+                rating_elem = fields.get('rating')
                 if rating_elem:
-                    match = re.search(r'(\d+\.?\d*)', rating_elem.get_text())
+                    match = _FLOAT_RE.search(rating_elem.get_text())
                     if match:
                         rating = float(match.group(1))
                 
                 reviews = None
-                reviews_elem = card.select_one('[data-csa-c-content-id*="reviews"]') or card.select_one('span.a-size-base.s-underline-text')
+                reviews_elem = fields.get('reviews_link') or fields.get('reviews_text')
                 if reviews_elem:
-                    match = re.search(r'([\d,]+)', reviews_elem.get_text())
+                    match = _COMMA_INT_RE.search(reviews_elem.get_text())
                     if match:
                         reviews = int(match.group(1).replace(',', ''))
                 
-                is_prime = bool(card.select_one('.a-icon-prime'))
+                is_prime = 'prime' in fields
                 
                 discount = None
                 if original_price and original_price > price:
@@ -994,23 +1474,44 @@ class AmazonScraper(BaseScraper):
                     is_prime=is_prime,
                     free_shipping=is_prime
                 ))
+                seen.add(asin)
             except Exception as e:
                 logger.debug(f"Amazon parse error: {e}")
                 continue
         
-        return products[:Config.RESULTS_PER_SITE]
+        return products
 
 # ============================================================
 # Flipkart Scraper
 # ============================================================
 
 class FlipkartScraper(BaseScraper):
+    # first_tags() rules for the fields of a result card
+    _CARD_FIELDS = {
+        ('a', 'class', 's1Q9rs'): 'name_link', ('div', 'class', '_4rR01T'): 'name_title',
+        ('a', 'class', 'IRpwTa'): 'name_fashion', ('a', 'class', 'wjcEIp'): 'name_grid',
+        ('div', 'class', '_30jeq3'): 'price', ('div', 'class', '_1_WHN1'): 'price_alt',
+        ('div', 'class', '_3I9_wc'): 'original', ('div', 'class', '_3Ay6Sb'): 'discount',
+        ('a', 'href', None): 'link',
+        ('img', 'class', '_396cs4'): 'image', ('img', 'class', '_2r_T1I'): 'image_alt',
+        ('div', 'class', '_3LWZlK'): 'rating',
+    }
+    # Result-card layouts, tried in order
+    _SEL_CARDS = tuple(sv.compile(s) for s in (
+        'div._1AtVbE > div._13oc-S', 'div._2kHMtA', 'div._1xHGtK._373qXS', 'div._4ddWXP'
+    ))
+    # Only the result-grid containers the card selectors above look inside
+    _CONTAINER_CLASSES = ('_1AtVbE', '_2kHMtA', '_1xHGtK', '_4ddWXP')
+    _CONTAINER_MARKERS = tuple(name.encode() for name in _CONTAINER_CLASSES)
+    _STRAINER = SoupStrainer('div', class_=class_pattern(*_CONTAINER_CLASSES))
+    
     def __init__(self):
         super().__init__()
         self.name = "Flipkart"
         self.base_url = "https://www.flipkart.com"
         self.search_url = "https://www.flipkart.com/search?q={query}"
         self.currency = "INR"
+        self._extract_price = price_extractor(self.currency)
     
     def search(self, query: str) -> List[Product]:
         products = []
@@ -1020,134 +1521,148 @@ class FlipkartScraper(BaseScraper):
         if not response:
             return products
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        cards = soup.select('div._1AtVbE > div._13oc-S')
-        if not cards:
-            cards = soup.select('div._2kHMtA')
-        if not cards:
-            cards = soup.select('div._1xHGtK._373qXS')
-        if not cards:
-            cards = soup.select('div._4ddWXP')
+        # Blocked or empty-result pages carry none of the grid classes; don't parse them
+        raw = response.content
+        if not any(marker in raw for marker in self._CONTAINER_MARKERS):
+            return products
+        soup = parse_html(raw, parse_only=self._STRAINER)
         
-        for card in cards:
-            try:
-                name_elem = (
-                    card.select_one('a.s1Q9rs') or
-                    card.select_one('div._4rR01T') or
-                    card.select_one('a.IRpwTa') or
-                    card.select_one('a.wjcEIp')
-                )
-                if not name_elem:
-                    continue
-                name = clean_text(name_elem.get_text() or name_elem.get('title', ''))
-                if not name:
-                    continue
-                
-                price_elem = (
-                    card.select_one('div._30jeq3') or
-                    card.select_one('div._1_WHN1')
-                )
-                if not price_elem:
-                    continue
-                price, _ = extract_price(price_elem.get_text(), self.currency)
-                if not price:
-                    continue
-                
-                original_price = None
-                original_elem = card.select_one('div._3I9_wc')
-                if original_elem:
-                    original_price, _ = extract_price(original_elem.get_text())
-                
-                discount = None
-                discount_elem = card.select_one('div._3Ay6Sb')
-                if discount_elem:
-                    match = re.search(r'(\d+)', discount_elem.get_text())
-                    if match:
-                        discount = float(match.group(1))
-                
-                link = card.find('a', href=True)
-                product_url = ""
-                if link:
-                    href = link.get('href', '')
-                    product_url = urljoin(self.base_url, href)
-                
-                img = card.select_one('img._396cs4') or card.select_one('img._2r_T1I')
-                image_url = ""
-                if img:
-                    image_url = img.get('src') or img.get('data-src', '')
-                
-                rating = None
-                rating_elem = card.select_one('div._3LWZlK')
-                if rating_elem:
-                    try:
-                        rating = float(rating_elem.get_text())
-                    except:
-                        pass
-                
-                products.append(Product(
-                    platform=self.name,
-                    name=name[:150],
-                    price=price,
-                    currency=self.currency,
-                    original_price=original_price,
-                    discount_percent=discount,
-                    url=product_url,
-                    image_url=image_url,
-                    rating=rating
-                ))
-            except Exception as e:
-                logger.debug(f"Flipkart parse error: {e}")
-                continue
+        cards = []
+        for selector in self._SEL_CARDS:
+            cards = selector.select(soup)
+            if cards:
+                break
         
-        return products[:Config.RESULTS_PER_SITE]
+        return list(islice(filter(None, map(self._extract_card, cards)), Config.RESULTS_PER_SITE))
+    
+    def _extract_card(self, card: Tag) -> Optional[Product]:
+        """Build a Product from one result card, or None when a required field is missing"""
+        try:
+            fields = first_tags(card, self._CARD_FIELDS)
+            name_elem = (
+                fields.get('name_link') or
+                fields.get('name_title') or
+                fields.get('name_fashion') or
+                fields.get('name_grid')
+            )
+            if not name_elem:
+                return None
+            name = clean_text(name_elem.get('title') or name_elem.get_text())
+            if not name:
+                return None
+            
+            price_elem = fields.get('price') or fields.get('price_alt')
+            if not price_elem:
+                return None
+            price, _ = self._extract_price(price_elem.get_text())
+            if not price:
+                return None
+            
+            original_price = None
+            original_elem = fields.get('original')
+            if original_elem:
+                original_price, _ = self._extract_price(original_elem.get_text())
+            
+            discount = None
+            discount_elem = fields.get('discount')
+            if discount_elem:
+                match = _INT_RE.search(discount_elem.get_text())
+                if match:
+                    discount = float(match.group(1))
+            
+            link = fields.get('link')
+            product_url = ""
+            if link:
+                href = link.get('href', '')
+                product_url = urljoin(self.base_url, href)
+            
+            img = fields.get('image') or fields.get('image_alt')
+            image_url = ""
+            if img:
+                image_url = img.get('src') or img.get('data-src', '')
+            
+            rating = None
+            rating_elem = fields.get('rating')
+            if rating_elem:
+                rating = to_float(rating_elem.get_text(), thousands=False)
+            
+            return Product(
+                platform=self.name,
+                name=name[:150],
+                price=price,
+                currency=self.currency,
+                original_price=original_price,
+                discount_percent=discount,
+                url=product_url,
+                image_url=image_url,
+                rating=rating
+            )
+        except Exception as e:
+            logger.debug(f"Flipkart parse error: {e}")
+            return None
 
 # ============================================================
 # Walmart Scraper
 # ============================================================
 
 class WalmartScraper(BaseScraper):
+    # first_tags() rules for the fields of a result card
+    _CARD_FIELDS = {
+        ('*', 'data-automation-id', 'product-title'): 'name', ('span', 'class', 'lh-title'): 'name_alt',
+        ('*', 'data-automation-id', 'product-price'): 'price', ('*', 'itemprop', 'price'): 'price_alt',
+        ('a', 'href', None): 'link',
+    }
+    # Result cards, and the item-stack layout to fall back on when there are none
+    _SEL_CARDS = sv.compile('[data-item-id]')
+    _SEL_STACKS = sv.compile('div[data-testid="item-stack"]')
+    _STRAINER = SoupStrainer(attrs={'data-item-id': True})
+    _STACK_STRAINER = SoupStrainer('div', attrs={'data-testid': 'item-stack'})
+    
     def __init__(self):
         super().__init__()
         self.name = "Walmart"
         self.base_url = "https://www.walmart.com"
         self.search_url = "https://www.walmart.com/search?q={query}"
         self.currency = "USD"
+        self._extract_price = price_extractor(self.currency)
     
     def search(self, query: str) -> List[Product]:
         products = []
         url = self.search_url.format(query=quote_plus(query))
         
-        headers = self._get_headers()
-        headers['Accept'] = 'text/html,application/xhtml+xml'
-        
         response = self._make_request(url)
         if not response:
             return products
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        cards = soup.select('[data-item-id]')
-        if not cards:
-            cards = soup.select('div[data-testid="item-stack"]')
+        # Only parse for a layout whose marker is in the page at all, so blocked or
+        # empty-result pages are never parsed
+        raw = response.content
+        cards = []
+        if b'data-item-id' in raw:
+            cards = self._SEL_CARDS.select(parse_html(raw, parse_only=self._STRAINER))
+        if not cards and b'item-stack' in raw:
+            cards = self._SEL_STACKS.select(parse_html(raw, parse_only=self._STACK_STRAINER))
         
         for card in cards:
+            if len(products) >= Config.RESULTS_PER_SITE:
+                break
             try:
-                name_elem = card.select_one('[data-automation-id="product-title"]') or card.select_one('span.lh-title')
+                fields = first_tags(card, self._CARD_FIELDS)
+                name_elem = fields.get('name') or fields.get('name_alt')
                 if not name_elem:
                     continue
                 name = clean_text(name_elem.get_text())
                 if not name:
                     continue
                 
-                price_elem = card.select_one('[data-automation-id="product-price"]') or card.select_one('[itemprop="price"]')
+                price_elem = fields.get('price') or fields.get('price_alt')
                 if not price_elem:
                     continue
-                price, _ = extract_price(price_elem.get_text(), self.currency)
+                price, _ = self._extract_price(price_elem.get_text())
                 if not price:
                     continue
                 
-                link = card.find('a', href=True)
+                link = fields.get('link')
                 product_url = ""
                 if link:
                     product_url = urljoin(self.base_url, link['href'])
@@ -1162,12 +1677,28 @@ class WalmartScraper(BaseScraper):
             except:
                 continue
         
-        return products[:Config.RESULTS_PER_SITE]
+        return products
 
 # ============================================================
 # Main T2Scrap Engine
 # ============================================================
 
+# attrgetter runs in C, unlike an equivalent def/lambda key
+_price_key = attrgetter('price')
+
+def unique_products(products: Iterable[Product]) -> Iterator[Product]:
+    """Yield products, skipping any that repeat a listing from another platform.
+    
+    Listings match on name, price and currency. Matches on the same platform are kept,
+    since they are usually different sellers or conditions.
+    """
+    seen: Dict[Tuple[str, float, str], str] = {}
+    for product in products:
+        key = (product.name.casefold(), round(product.price, 2), product.currency)
+        platform = seen.setdefault(key, product.platform)
+        if platform == product.platform:
+            yield product
+
 class T2Scrap:
     def __init__(self):
         self.scrapers: List[BaseScraper] = [
@@ -1179,44 +1710,86 @@ class T2Scrap:
         ]
         self.cache = CacheManager()
         self.history = SearchHistory()
-        self._lock = threading.Lock()
         self._current_results: List[Product] = []
+        # Shared by every search. Tasks a timed-out search leaves running are tracked per
+        # platform, and a platform with WORKERS_PER_PLATFORM of them is skipped until they
+        # finish, so one wedged site can't take over the workers the others need.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(self.scrapers) * Config.WORKERS_PER_PLATFORM, Config.MAX_WORKERS),
+            thread_name_prefix="t2scrap"
+        )
+        self._stragglers: Dict[str, List[Future]] = {s.name: [] for s in self.scrapers}
+        self._stragglers_lock = threading.Lock()
     
     @property
     def platform_names(self) -> List[str]:
         return [s.name for s in self.scrapers]
     
+    def _cached_platform(self, scraper: BaseScraper, query: str) -> Optional[Tuple[str, List[Product], bool]]:
+        cached = self.cache.get(scraper.name, query)
+        if cached:
+            return (scraper.name, sorted(cached, key=_price_key), True)
+        return None
+    
+    def _search_platform(self, scraper: BaseScraper, query: str, use_cache: bool) -> Tuple[str, List[Product], bool]:
+        if use_cache:
+            cached = self._cached_platform(scraper, query)
+            if cached:
+                return cached
+        
+        try:
+            # Sorted per platform so search() can merge instead of re-sorting everything
+            products = sorted(scraper.search(query), key=_price_key)
+            if products and use_cache:
+                self.cache.set(scraper.name, query, products)
+            return (scraper.name, products, False)
+        except Exception as e:
+            logger.error(f"Error searching {scraper.name}: {e}")
+            return (scraper.name, [], False)
+    
+    def _submit_platform(self, scraper: BaseScraper, query: str, use_cache: bool) -> Optional[Future]:
+        """Queue a platform search, or return None if timed-out searches still hold its share of workers"""
+        with self._stragglers_lock:
+            running = [f for f in self._stragglers.setdefault(scraper.name, []) if not f.done()]
+            self._stragglers[scraper.name] = running
+            if len(running) >= Config.WORKERS_PER_PLATFORM:
+                return None
+        return self._executor.submit(self._search_platform, scraper, query, use_cache)
+    
+    def _leave_behind(self, futures: Dict[Future, BaseScraper]) -> None:
+        """Cancel a timed-out search's queued tasks and track the ones still running"""
+        with self._stragglers_lock:
+            for future, scraper in futures.items():
+                if not future.cancel() and not future.done():
+                    self._stragglers.setdefault(scraper.name, []).append(future)
+    
     def search(self, query: str, use_cache: bool = True) -> SearchResult:
-        self._current_results = []
         start_time = time.time()
         
         print(f"\n{'='*50}")
         print(f"Searching for: {query}")
         print(f"{'='*50}")
         
-        def search_platform(scraper: BaseScraper) -> Tuple[str, List[Product], bool]:
-            if use_cache:
-                cached = self.cache.get(scraper.name, query)
-                if cached:
-                    return (scraper.name, cached, True)
-            
-            try:
-                products = scraper.search(query)
-                if products and use_cache:
-                    self.cache.set(scraper.name, query, products)
-                return (scraper.name, products, False)
-            except Exception as e:
-                logger.error(f"Error searching {scraper.name}: {e}")
-                return (scraper.name, [], False)
-        
-        with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
-            futures = {executor.submit(search_platform, s): s for s in self.scrapers}
-            
-            for future in as_completed(futures):
+        per_platform: Dict[str, List[Product]] = {}
+        futures: Dict[Future, BaseScraper] = {}
+        for scraper in self.scrapers:
+            future = self._submit_platform(scraper, query, use_cache)
+            if future is not None:
+                futures[future] = scraper
+                continue
+            # Earlier timed-out searches are still stuck on this site; answer from the cache or skip it
+            cached = self._cached_platform(scraper, query) if use_cache else None
+            if cached:
+                per_platform[scraper.name] = cached[1]
+                print(f"  ✓ {scraper.name}: {len(cached[1])} products (cached)")
+            else:
+                logger.warning(f"Skipping {scraper.name}: timed-out searches are still running")
+                print(f"  ✗ {scraper.name}: busy")
+        try:
+            for future in as_completed(futures, timeout=Config.SEARCH_TIMEOUT):
                 try:
                     platform, products, from_cache = future.result()
-                    with self._lock:
-                        self._current_results.extend(products)
+                    per_platform[platform] = products
                     
                     status = "✓" if products else "✗"
                     cache_tag = " (cached)" if from_cache else ""
@@ -1228,14 +1801,27 @@ class T2Scrap:
                         
                 except Exception as e:
                     logger.error(f"Future error: {e}")
+        except FuturesTimeoutError:
+            # Return what finished; stragglers keep running and still fill the cache
+            slow = [futures[f].name for f in futures if not f.done()]
+            logger.warning(f"Search timed out waiting for: {', '.join(slow)}")
+            for name in slow:
+                print(f"  ✗ {name}: timed out")
+            # Drop any that never started; running ones finish in the background
+            self._leave_behind(futures)
         
-        self._current_results.sort(key=lambda p: p.price)
+        # Built locally and published once, so concurrent searches never see a half-filled list
+        # The same listing often shows up on several platforms (resellers); keep the first
+        # Merged in self.scrapers order, so price ties resolve the same way on every search
+        ordered = [per_platform[s.name] for s in self.scrapers if s.name in per_platform]
+        results = list(unique_products(heapq.merge(*ordered, key=_price_key)))
+        self._current_results = results
         
         search_time = time.time() - start_time
         
         result = SearchResult(
             query=query,
-            products=self._current_results.copy(),
+            products=results.copy(),
             search_time=search_time
         )
         
@@ -1248,8 +1834,18 @@ class T2Scrap:
         
         return result
     
+    async def search_async(self, query: str, use_cache: bool = True) -> SearchResult:
+        """Run search off the event loop so async callers are never blocked"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.search, query, use_cache=use_cache))
+    
     def cleanup(self) -> None:
-        pass
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+        self.history.close()
+        extract_price.cache_clear()
+        clean_text.cache_clear()
+        slugify.cache_clear()
 
 
 # Test the scraper directly
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+import soupsieve as sv
+from bs4 import BeautifulSoup
+
+from main import AmazonScraper, Config, FlipkartScraper, WalmartScraper, first_tags
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+# The select_one() calls AmazonScraper made for each field before _collect_fields()
+AMAZON_SELECTORS = {
+    'name_link': 'h2 a span', 'name_heading': 'h2 span', 'name_text': '.a-text-normal',
+    'price': '.a-price .a-offscreen', 'price_whole': '.a-price-whole', 'price_fraction': '.a-price-fraction',
+    'original': '.a-text-price .a-offscreen',
+    'image': 'img.s-image',
+    'rating': '.a-icon-star-small .a-icon-alt',
+    'reviews_link': '[data-csa-c-content-id*="reviews"]', 'reviews_text': 'span.a-size-base.s-underline-text',
+    'prime': '.a-icon-prime',
+    'sponsored': '.s-sponsored-label-info-icon',
+}
+
+# The "or" chains FlipkartScraper and WalmartScraper ran before first_tags()
+FLIPKART_CHAINS = {
+    ('name_link', 'name_title', 'name_fashion', 'name_grid'): ('a.s1Q9rs', 'div._4rR01T', 'a.IRpwTa', 'a.wjcEIp'),
+    ('price', 'price_alt'): ('div._30jeq3', 'div._1_WHN1'),
+    ('original',): ('div._3I9_wc',),
+    ('discount',): ('div._3Ay6Sb',),
+    ('image', 'image_alt'): ('img._396cs4', 'img._2r_T1I'),
+    ('rating',): ('div._3LWZlK',),
+}
+WALMART_CHAINS = {
+    ('name', 'name_alt'): ('[data-automation-id="product-title"]', 'span.lh-title'),
+    ('price', 'price_alt'): ('[data-automation-id="product-price"]', '[itemprop="price"]'),
+}
+
+
+def load_cards(name, selector):
+    soup = BeautifulSoup((FIXTURES / name).read_bytes(), Config.HTML_PARSER)
+    cards = sv.select(selector, soup)
+    assert cards
+    return cards
+
+
+def first_of(fields, keys):
+    return next((fields[key] for key in keys if fields.get(key) is not None), None)
+
+
+def chain(card, selectors):
+    return next((m for m in (sv.select_one(s, card) for s in selectors) if m is not None), None)
+
+
+AMAZON_CARDS = load_cards('amazon_cards.html', '[data-asin]')
+
+
+@pytest.mark.parametrize('card', AMAZON_CARDS, ids=lambda c: c['data-asin'])
+def test_amazon_collect_fields_matches_select_one(card):
+    fields = AmazonScraper()._collect_fields(card)
+    for key, selector in AMAZON_SELECTORS.items():
+        assert fields.get(key) is sv.select_one(selector, card), (key, selector)
+    assert set(fields) <= set(AMAZON_SELECTORS)
+
+
+def test_amazon_fixtures_cover_every_field():
+    scraper = AmazonScraper()
+    seen = set()
+    for card in AMAZON_CARDS:
+        seen.update(scraper._collect_fields(card))
+    assert seen == set(AMAZON_SELECTORS)
+
+
+@pytest.mark.parametrize('scraper, fixture, card_selector, chains', [
+    (FlipkartScraper, 'flipkart_cards.html', 'div._1AtVbE > div._13oc-S', FLIPKART_CHAINS),
+    (WalmartScraper, 'walmart_cards.html', '[data-item-id]', WALMART_CHAINS),
+], ids=['flipkart', 'walmart'])
+def test_first_tags_matches_select_one_chains(scraper, fixture, card_selector, chains):
+    for card in load_cards(fixture, card_selector):
+        fields = first_tags(card, scraper._CARD_FIELDS)
+        for keys, selectors in chains.items():
+            assert first_of(fields, keys) is chain(card, selectors), (keys, str(card))
+        assert fields.get('link') is card.find('a', href=True)
@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from main import Config, Product, T2Scrap, unique_products
+
+
+class FakeScraper:
+    def __init__(self, name, release=None, delay=0.0):
+        self.name = name
+        self.release = release
+        self.delay = delay
+    
+    def search(self, query):
+        if self.release is not None:
+            # Stands in for a site whose host slot never frees up
+            self.release.wait()
+        time.sleep(self.delay)
+        return [Product(platform=self.name, name=f"{self.name} {query}", price=10.0)]
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, 'SEARCH_TIMEOUT', 0.3)
+    t2 = T2Scrap()
+    yield t2
+    t2.cleanup()
+
+
+def test_wedged_platform_does_not_starve_later_searches(engine):
+    release = threading.Event()
+    engine.scrapers = [
+        FakeScraper('Wedged', release),
+        *(FakeScraper(f"Site{i}") for i in range(len(engine.scrapers) - 1)),
+    ]
+    healthy = {s.name for s in engine.scrapers[1:]}
+    try:
+        # Far more searches than pool workers, each leaving a Wedged task behind
+        for i in range(engine._executor._max_workers + 4):
+            result = engine.search(f"query {i}", use_cache=False)
+            assert {p.platform for p in result.products} == healthy
+    finally:
+        release.set()
+
+
+def test_busy_platform_is_served_from_cache(engine):
+    release = threading.Event()
+    wedged = FakeScraper('Wedged', release)
+    engine.scrapers = [wedged]
+    cached = [Product(platform='Wedged', name='cached item', price=5.0)]
+    engine.cache.set('Wedged', 'phone', cached)
+    try:
+        for i in range(Config.WORKERS_PER_PLATFORM):
+            engine.search(f"other {i}", use_cache=False)
+        result = engine.search('phone')
+        assert [p.name for p in result.products] == ['cached item']
+    finally:
+        release.set()
+
+
+def test_concurrent_healthy_searches_all_get_results(engine, monkeypatch):
+    monkeypatch.setattr(Config, 'SEARCH_TIMEOUT', 5)
+    engine.scrapers = [FakeScraper(f"Site{i}", delay=0.2) for i in range(len(engine.scrapers))]
+    sites = {s.name for s in engine.scrapers}
+    # More concurrent searches than WORKERS_PER_PLATFORM, as /api/search sees under load
+    searches = Config.WORKERS_PER_PLATFORM + 2
+    with ThreadPoolExecutor(max_workers=searches) as callers:
+        results = list(callers.map(lambda i: engine.search(f"query {i}", use_cache=False), range(searches)))
+    for result in results:
+        assert {p.platform for p in result.products} == sites
+
+
+def test_unique_products_keeps_same_platform_listings():
+    products = [
+        Product(platform='eBay', name='Camera Lens', price=99.0, seller='a'),
+        Product(platform='eBay', name='camera lens', price=99.0, seller='b', condition='Used'),
+        Product(platform='Amazon', name='Camera Lens', price=99.0),
+        Product(platform='Amazon', name='Camera Lens', price=99.0, currency='INR'),
+    ]
+    assert [(p.platform, p.seller, p.currency) for p in unique_products(products)] == [
+        ('eBay', 'a', 'USD'), ('eBay', 'b', 'USD'), ('Amazon', '', 'INR'),
+    ]
+
+
+class ListingScraper(FakeScraper):
+    def search(self, query):
+        time.sleep(self.delay)
+        return [Product(platform=self.name, name='Same Listing', price=10.0)]
+
+
+def test_cross_platform_ties_keep_the_first_scraper(engine):
+    # The first scraper answers last, so completion order alone would keep the other
+    engine.scrapers = [ListingScraper('First', delay=0.1), ListingScraper('Second')]
+    for i in range(3):
+        result = engine.search(f"query {i}", use_cache=False)
+        assert [p.platform for p in result.products] == ['First']
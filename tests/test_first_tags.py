@@ -0,0 +1,99 @@
+import json
+import random
+
+import pytest
+import soupsieve as sv
+from bs4 import BeautifulSoup
+
+from main import (
+    AliExpressScraper, Config, DarazScraper, EbayScraper, FlipkartScraper, WalmartScraper, first_tags,
+)
+
+SCRAPERS = [DarazScraper, EbayScraper, AliExpressScraper, FlipkartScraper, WalmartScraper]
+
+
+def as_selectors(rules):
+    """The selector group each rule key stands for, e.g. '.s-item__shipping, .s-item__freeXDays'"""
+    groups = {}
+    for (tag, attr, value), key in rules.items():
+        tag = '' if tag == '*' else tag
+        if attr is None:
+            selector = tag
+        elif attr == 'class':
+            selector = f"{tag}.{value}"
+        elif value is None:
+            selector = f"{tag}[{attr}]"
+        else:
+            selector = f"{tag}[{attr}={json.dumps(value)}]"
+        groups.setdefault(key, []).append(selector)
+    return {key: ', '.join(selectors) for key, selectors in groups.items()}
+
+
+def card(markup):
+    return BeautifulSoup(f"<div id='card'>{markup}</div>", Config.HTML_PARSER).find(id='card')
+
+
+def assert_matches_soupsieve(element, rules):
+    found = first_tags(element, rules)
+    for key, selector in as_selectors(rules).items():
+        assert found.get(key) is sv.select_one(selector, element), (key, selector, str(element))
+
+
+HAND_WRITTEN = [
+    # Several rules sharing one key: the first in document order wins, whichever rule it hits
+    (EbayScraper, '<span class="s-item__freeXDays">Free 3 day</span><span class="s-item__shipping">+$4</span>'),
+    (EbayScraper, '<span class="s-item__shipping s-item__logisticsCost">+$4</span>'
+                  '<span class="s-item__freeXDays">Free</span>'),
+    (EbayScraper, '<div class="s-item__title"><span>Name</span></div><a class="s-item__link x" href="/i">l</a>'
+                  '<img class="s-item__image-img"><span class="SECONDARY_INFO">Used</span>'),
+    # Attribute-less h2 and img, and a card without them
+    (DarazScraper, '<h2>Heading</h2><img><a href="/p">x</a>'),
+    (DarazScraper, '<div class="title--wFj93"><a title="T" href="/p">T</a></div><img src="i.jpg">'),
+    (DarazScraper, '<div data-qa-locator="product-name">N</div><div class="title">C</div>'),
+    (DarazScraper, '<a>no href</a><span>no heading</span>'),
+    (AliExpressScraper, '<h3>three</h3><h1>one</h1><img><a href="/item">x</a>'),
+    (AliExpressScraper, '<a name="x">no href</a>'),
+    (FlipkartScraper, '<div class="_4rR01T">Phone</div><div class="_30jeq3 _1_WHN1">₹9,999</div>'
+                      '<div class="_3I9_wc _27UcVY">₹12,999</div><div class="_3Ay6Sb"><span>23% off</span></div>'
+                      '<img class="_396cs4" src="a.jpg"><div class="_3LWZlK">4.3<img></div>'),
+    (FlipkartScraper, '<a class="IRpwTa" href="/f">Shirt</a><img class="_2r_T1I"><div class="_1_WHN1">₹499</div>'),
+    # Tag-qualified rules must not match the same class on another tag
+    (FlipkartScraper, '<span class="_30jeq3">not a div</span><a class="_4rR01T s1Q9rs" href="/x">n</a>'),
+    (WalmartScraper, '<span data-automation-id="product-title">Name</span><span class="lh-title w">Alt</span>'
+                     '<div itemprop="price">$5</div><div data-automation-id="product-price">$4</div>'),
+    (WalmartScraper, '<span data-automation-id="product-title-x">near miss</span><a href="">empty href</a>'),
+]
+
+
+@pytest.mark.parametrize('scraper, markup', HAND_WRITTEN)
+def test_first_tags_matches_soupsieve_on_hand_written_cards(scraper, markup):
+    assert_matches_soupsieve(card(markup), scraper._CARD_FIELDS)
+
+
+def random_card(rng, rules, depth=0):
+    """Nested markup mixing the tags, attributes and values the rules mention with near misses"""
+    tags = sorted({t for t, _, _ in rules if t != '*'} | {'div', 'span', 'a', 'img', 'h2'})
+    attrs = sorted({a for _, a, _ in rules if a})
+    values = sorted({v for _, _, v in rules if v}) + ['other', 'title--x']
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        tag = rng.choice(tags)
+        attr_text = ''
+        for attr in rng.sample(attrs, rng.randint(0, min(2, len(attrs)))):
+            if attr == 'class':
+                attr_text += f' class="{" ".join(rng.sample(values, rng.randint(1, 3)))}"'
+            else:
+                attr_text += f' {attr}="{rng.choice(values)}"'
+        if tag == 'img':
+            parts.append(f'<img{attr_text}>')
+        else:
+            inner = random_card(rng, rules, depth + 1) if depth < 2 and rng.random() < 0.5 else 'x'
+            parts.append(f'<{tag}{attr_text}>{inner}</{tag}>')
+    return ''.join(parts)
+
+
+@pytest.mark.parametrize('scraper', SCRAPERS, ids=lambda s: s.__name__)
+def test_first_tags_matches_soupsieve_on_random_cards(scraper):
+    rng = random.Random(scraper.__name__)
+    for _ in range(300):
+        assert_matches_soupsieve(card(random_card(rng, scraper._CARD_FIELDS)), scraper._CARD_FIELDS)
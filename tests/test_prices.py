@@ -0,0 +1,82 @@
+import pytest
+
+from main import _PRICE_SHAPE_RE, extract_price, price_extractor
+
+# (text, default currency, expected) grouped by the branch of extract_price that handles them
+FAST = [
+    ('$12.99', 'USD', (12.99, 'USD')),
+    ('$1,299.00', 'USD', (1299.0, 'USD')),
+    ('  $ 3 ', 'USD', (3.0, 'USD')),
+    ('1,499', 'INR', (1499.0, 'INR')),
+    ('₹1,499', 'INR', (1499.0, 'INR')),
+    ('₹ 12,999', 'USD', (12999.0, 'INR')),
+    ('£5', 'USD', (5.0, 'GBP')),
+    ('€19.9', 'USD', (19.9, 'EUR')),
+]
+SHAPE = [
+    ('US $12.99', 'USD', (12.99, 'USD')),
+    ('USD 5.00', 'NPR', (5.0, 'NPR')),
+    ('usd 7.5', 'USD', (7.5, 'USD')),
+    ('GBP 10', 'EUR', (10.0, 'EUR')),
+    ('Rs. 1,200', 'NPR', (1200.0, 'INR')),
+    ('Rs 450', 'PKR', (450.0, 'INR')),
+    ('NPR 2,500', 'NPR', (2500.0, 'NPR')),
+    ('PKR 3,999', 'PKR', (3999.0, 'PKR')),
+    ('৳ 500', 'BDT', (500.0, 'BDT')),
+    ('Tk 450', 'BDT', (450.0, 'BDT')),
+    ('රු 2,500', 'LKR', (2500.0, 'LKR')),
+    ('¥300', 'USD', (300.0, 'JPY')),
+]
+LEGACY = [
+    ('current price $4.88', 'USD', (4.88, 'USD')),
+    ('$20.00 to $50.00', 'USD', (20.0, 'USD')),
+    ('Now: £14.99 each', 'USD', (14.99, 'GBP')),
+    ('12.999', 'USD', (12.99, 'USD')),
+    ('$.99', 'USD', (99.0, 'USD')),
+    ('१२३', 'NPR', (123.0, 'NPR')),
+    ('Free', 'USD', (None, 'USD')),
+    ('', 'USD', (None, 'USD')),
+]
+
+
+@pytest.mark.parametrize('text, currency, expected', FAST + SHAPE + LEGACY)
+def test_extract_price(text, currency, expected):
+    assert extract_price(text, currency) == expected
+
+
+@pytest.mark.parametrize('text', [text for text, _, _ in SHAPE])
+def test_shape_cases_are_handled_by_price_shape_re(text):
+    assert _PRICE_SHAPE_RE.fullmatch(text)
+
+
+@pytest.mark.parametrize('text', [text for text, _, _ in LEGACY if text])
+def test_legacy_cases_fall_through_price_shape_re(text):
+    assert _PRICE_SHAPE_RE.fullmatch(text) is None
+
+
+@pytest.mark.parametrize('currency, text, expected', [
+    # The scraper's own symbols keep its currency, even where "Rs." alone would read as INR
+    ('USD', '$9.99', (9.99, 'USD')),
+    ('USD', 'US $ 9.99', (9.99, 'USD')),
+    ('USD', '1,234.50', (1234.5, 'USD')),
+    ('INR', '₹1,499', (1499.0, 'INR')),
+    ('INR', 'Rs. 1,200', (1200.0, 'INR')),
+    ('NPR', 'Rs. 1,200', (1200.0, 'NPR')),
+    ('NPR', 'NPR 2,500', (2500.0, 'NPR')),
+    ('PKR', 'Rs. 1,200', (1200.0, 'PKR')),
+    ('LKR', 'Rs. 1,200', (1200.0, 'LKR')),
+    ('LKR', 'රු 2,500', (2500.0, 'LKR')),
+    ('BDT', '৳ 80', (80.0, 'BDT')),
+    ('GBP', '£3', (3.0, 'GBP')),
+    ('EUR', '€4,000', (4000.0, 'EUR')),
+    ('JPY', '1,234.50', (1234.5, 'JPY')),
+    # Anything else is left to extract_price
+    ('USD', 'from $5', (5.0, 'USD')),
+    ('USD', '12.999', (12.99, 'USD')),
+    ('NPR', '₹1,499', (1499.0, 'INR')),
+    ('INR', '$9.99', (9.99, 'USD')),
+    ('USD', '¥300', (300.0, 'JPY')),
+    ('BDT', 'Free', (None, 'BDT')),
+])
+def test_price_extractor(currency, text, expected):
+    assert price_extractor(currency)(text) == expected